@@ -169,20 +169,20 @@ class DriverBridge:
     # ── internal ──
 
     def _ioctl(self, code: int, in_data: bytes, out_size: int) -> bytes:
-        in_buf = (ctypes.c_ubyte * max(1, len(in_data)))()
-        for i, b in enumerate(in_data):
-            in_buf[i] = b
+        n = len(in_data)
+        in_buf = (ctypes.c_ubyte * max(1, n))()
+        ctypes.memmove(in_buf, in_data, n)
         out_buf = (ctypes.c_ubyte * out_size)()
         returned = wintypes.DWORD(0)
         ok = DeviceIoControl(
             self._handle, code,
-            ctypes.byref(in_buf), len(in_data),
+            ctypes.byref(in_buf), n,
             ctypes.byref(out_buf), out_size,
             ctypes.byref(returned), None,
         )
         if not ok:
             raise ctypes.WinError(ctypes.get_last_error())
-        return bytes(out_buf[: returned.value])
+        return ctypes.string_at(out_buf, returned.value)
 
     def __del__(self) -> None:
         self.close()
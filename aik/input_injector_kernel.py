@@ -314,7 +314,7 @@ class KernelInputInjector:
         )
         if not ok:
             raise ctypes.WinError(ctypes.get_last_error())
-        resp = bytes(out_buf[:returned.value]).decode("ascii", errors="replace").rstrip("\x00")
+        resp = ctypes.string_at(out_buf, returned.value).decode("ascii", errors="replace").rstrip("\x00")
         log.info("Driver PING -> %s", resp)
 
     def close(self) -> None:
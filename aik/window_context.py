@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 
 import win32api
@@ -16,7 +17,24 @@ class ForegroundWindow:
     process_path: str | None
 
 
-def get_foreground_window() -> ForegroundWindow:
+# Calls with use_cache=True inside this window reuse the previous lookup.
+_FG_CACHE_TTL_S = 0.1
+_fg_cache: tuple[float, ForegroundWindow] | None = None
+
+
+def get_foreground_window(use_cache: bool = False) -> ForegroundWindow:
+    global _fg_cache
+    if use_cache:
+        now = time.monotonic()
+        if _fg_cache is not None and now - _fg_cache[0] < _FG_CACHE_TTL_S:
+            return _fg_cache[1]
+        fg = _query_foreground_window()
+        _fg_cache = (now, fg)
+        return fg
+    return _query_foreground_window()
+
+
+def _query_foreground_window() -> ForegroundWindow:
     hwnd = win32gui.GetForegroundWindow()
     title = ""
     pid = 0
@@ -0,0 +1,197 @@
+"""
+Thin ctypes wrapper over the Win32 Service Control Manager (advapi32).
+
+Used by driver_loader.py to manage the AikKmdfIoctl service in-process
+instead of spawning sc.exe for every operation.
+"""
+from __future__ import annotations
+
+import contextlib
+import ctypes
+import functools
+from ctypes import wintypes
+from typing import Iterator
+
+# Request only the rights each call needs, so read-only queries work
+# without elevation (like `sc query`).
+SC_MANAGER_CONNECT = 0x0001
+SC_MANAGER_CREATE_SERVICE = 0x0002
+
+SERVICE_QUERY_STATUS = 0x0004
+SERVICE_START = 0x0010
+SERVICE_STOP = 0x0020
+DELETE = 0x00010000
+
+SERVICE_KERNEL_DRIVER = 0x00000001
+SERVICE_DEMAND_START = 0x00000003
+SERVICE_ERROR_NORMAL = 0x00000001
+
+SERVICE_CONTROL_STOP = 0x00000001
+SC_STATUS_PROCESS_INFO = 0
+
+ERROR_SERVICE_EXISTS = 1073
+
+SERVICE_STATES = {
+    1: "STOPPED",
+    2: "START_PENDING",
+    3: "STOP_PENDING",
+    4: "RUNNING",
+    5: "CONTINUE_PENDING",
+    6: "PAUSE_PENDING",
+    7: "PAUSED",
+}
+
+
+class SERVICE_STATUS(ctypes.Structure):
+    _fields_ = [
+        ("dwServiceType", wintypes.DWORD),
+        ("dwCurrentState", wintypes.DWORD),
+        ("dwControlsAccepted", wintypes.DWORD),
+        ("dwWin32ExitCode", wintypes.DWORD),
+        ("dwServiceSpecificExitCode", wintypes.DWORD),
+        ("dwCheckPoint", wintypes.DWORD),
+        ("dwWaitHint", wintypes.DWORD),
+    ]
+
+
+class SERVICE_STATUS_PROCESS(ctypes.Structure):
+    _fields_ = SERVICE_STATUS._fields_ + [
+        ("dwProcessId", wintypes.DWORD),
+        ("dwServiceFlags", wintypes.DWORD),
+    ]
+
+
+@functools.cache
+def _advapi32() -> ctypes.WinDLL:
+    """Load advapi32 on first use so importing this module works off Windows."""
+    advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+
+    advapi32.OpenSCManagerW.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, wintypes.DWORD]
+    advapi32.OpenSCManagerW.restype = wintypes.HANDLE
+
+    advapi32.OpenServiceW.argtypes = [wintypes.HANDLE, wintypes.LPCWSTR, wintypes.DWORD]
+    advapi32.OpenServiceW.restype = wintypes.HANDLE
+
+    advapi32.CreateServiceW.argtypes = [
+        wintypes.HANDLE,
+        wintypes.LPCWSTR,
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.LPCWSTR,
+        wintypes.LPCWSTR,
+        wintypes.LPDWORD,
+        wintypes.LPCWSTR,
+        wintypes.LPCWSTR,
+        wintypes.LPCWSTR,
+    ]
+    advapi32.CreateServiceW.restype = wintypes.HANDLE
+
+    advapi32.StartServiceW.argtypes = [wintypes.HANDLE, wintypes.DWORD, wintypes.LPVOID]
+    advapi32.StartServiceW.restype = wintypes.BOOL
+
+    advapi32.ControlService.argtypes = [
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        ctypes.POINTER(SERVICE_STATUS),
+    ]
+    advapi32.ControlService.restype = wintypes.BOOL
+
+    advapi32.DeleteService.argtypes = [wintypes.HANDLE]
+    advapi32.DeleteService.restype = wintypes.BOOL
+
+    advapi32.QueryServiceStatusEx.argtypes = [
+        wintypes.HANDLE,
+        ctypes.c_int,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        wintypes.LPDWORD,
+    ]
+    advapi32.QueryServiceStatusEx.restype = wintypes.BOOL
+
+    advapi32.CloseServiceHandle.argtypes = [wintypes.HANDLE]
+    advapi32.CloseServiceHandle.restype = wintypes.BOOL
+    return advapi32
+
+
+def _check(result: int) -> int:
+    if not result:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return result
+
+
+@contextlib.contextmanager
+def _manager(access: int = SC_MANAGER_CONNECT) -> Iterator[int]:
+    api = _advapi32()
+    h = _check(api.OpenSCManagerW(None, None, access))
+    try:
+        yield h
+    finally:
+        api.CloseServiceHandle(h)
+
+
+@contextlib.contextmanager
+def _service(name: str, access: int) -> Iterator[int]:
+    api = _advapi32()
+    with _manager() as scm:
+        h = _check(api.OpenServiceW(scm, name, access))
+        try:
+            yield h
+        finally:
+            api.CloseServiceHandle(h)
+
+
+def create_kernel_service(name: str, bin_path: str) -> None:
+    """Register a demand-start kernel driver service."""
+    api = _advapi32()
+    with _manager(SC_MANAGER_CREATE_SERVICE) as scm:
+        h = _check(api.CreateServiceW(
+            scm,
+            name,
+            name,
+            SERVICE_QUERY_STATUS,  # the returned handle is closed right away
+            SERVICE_KERNEL_DRIVER,
+            SERVICE_DEMAND_START,
+            SERVICE_ERROR_NORMAL,
+            bin_path,
+            None,
+            None,
+            None,
+            None,
+            None,
+        ))
+        api.CloseServiceHandle(h)
+
+
+def start_service(name: str) -> None:
+    with _service(name, SERVICE_START) as h:
+        _check(_advapi32().StartServiceW(h, 0, None))
+
+
+def stop_service(name: str) -> str:
+    """Send SERVICE_CONTROL_STOP; returns the reported service state."""
+    status = SERVICE_STATUS()
+    with _service(name, SERVICE_STOP) as h:
+        _check(_advapi32().ControlService(h, SERVICE_CONTROL_STOP, ctypes.byref(status)))
+    return SERVICE_STATES.get(status.dwCurrentState, str(status.dwCurrentState))
+
+
+def delete_service(name: str) -> None:
+    with _service(name, DELETE) as h:
+        _check(_advapi32().DeleteService(h))
+
+
+def query_service_state(name: str) -> str:
+    status = SERVICE_STATUS_PROCESS()
+    needed = wintypes.DWORD(0)
+    with _service(name, SERVICE_QUERY_STATUS) as h:
+        _check(_advapi32().QueryServiceStatusEx(
+            h,
+            SC_STATUS_PROCESS_INFO,
+            ctypes.byref(status),
+            ctypes.sizeof(status),
+            ctypes.byref(needed),
+        ))
+    return SERVICE_STATES.get(status.dwCurrentState, str(status.dwCurrentState))
@@ -2,12 +2,13 @@
 Driver management utility.
 
 Installs, starts, stops, and removes the AikKmdfIoctl kernel driver
-using the Windows Service Control Manager (sc.exe).
+using the Windows Service Control Manager (advapi32, see _scm.py).
 
 Must be run as Administrator.
 
 Usage:
     python tools/driver_loader.py install  --sys path\\to\\AikKmdfIoctl.sys
+    python tools/driver_loader.py install  --sys path\\to\\AikKmdfIoctl.sys --fast
     python tools/driver_loader.py start
     python tools/driver_loader.py stop
     python tools/driver_loader.py remove
@@ -20,58 +21,77 @@ import os
 import subprocess
 import sys
 
+import _scm
+
 SERVICE_NAME = "AikKmdfIoctl"
 
 
 def _run(cmd: list[str]) -> tuple[int, str]:
-    r = subprocess.run(cmd, capture_output=True, text=True)
-    out = (r.stdout + "\n" + r.stderr).strip()
-    return r.returncode, out
+    r = subprocess.run(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    return r.returncode, r.stdout.strip()
 
 
-def install(sys_path: str) -> None:
+def install(sys_path: str, fast: bool = False) -> None:
     abspath = os.path.abspath(sys_path)
     if not os.path.isfile(abspath):
         print(f"ERROR: driver file not found: {abspath}", file=sys.stderr)
         sys.exit(1)
 
     # Ensure test signing is on – required for unsigned drivers.
-    rc, out = _run(["bcdedit", "/enum", "{current}"])
-    if "testsigning" not in out.lower() or "yes" not in out.lower():
-        print("WARNING: Test Signing does not appear to be enabled.")
-        print("  Run:  bcdedit /set testsigning on")
-        print("  Then reboot before loading unsigned drivers.\n")
-
-    rc, out = _run([
-        "sc", "create", SERVICE_NAME,
-        "type=", "kernel",
-        "start=", "demand",
-        f"binPath=", abspath,
-    ])
-    print(f"sc create -> {out}")
-    if rc != 0 and "already exists" not in out.lower():
-        sys.exit(rc)
+    if not fast:
+        rc, out = _run(["bcdedit", "/enum", "{current}"])
+        if "testsigning" not in out.lower() or "yes" not in out.lower():
+            print("WARNING: Test Signing does not appear to be enabled.")
+            print("  Run:  bcdedit /set testsigning on")
+            print("  Then reboot before loading unsigned drivers.\n")
+
+    try:
+        _scm.create_kernel_service(SERVICE_NAME, abspath)
+        print("create -> OK")
+    except OSError as exc:
+        print(f"create -> {exc}")
+        if exc.winerror != _scm.ERROR_SERVICE_EXISTS:
+            sys.exit(1)
 
 
 def start() -> None:
-    rc, out = _run(["sc", "start", SERVICE_NAME])
-    print(f"sc start -> {out}")
+    try:
+        _scm.start_service(SERVICE_NAME)
+        print("start -> OK")
+    except OSError as exc:
+        print(f"start -> {exc}")
 
 
 def stop() -> None:
-    rc, out = _run(["sc", "stop", SERVICE_NAME])
-    print(f"sc stop -> {out}")
+    try:
+        state = _scm.stop_service(SERVICE_NAME)
+        print(f"stop -> {state}")
+    except OSError as exc:
+        print(f"stop -> {exc}")
 
 
 def remove() -> None:
     stop()
-    rc, out = _run(["sc", "delete", SERVICE_NAME])
-    print(f"sc delete -> {out}")
+    try:
+        _scm.delete_service(SERVICE_NAME)
+        print("delete -> OK")
+    except OSError as exc:
+        print(f"delete -> {exc}")
 
 
 def status() -> None:
-    rc, out = _run(["sc", "query", SERVICE_NAME])
-    print(out)
+    try:
+        state = _scm.query_service_state(SERVICE_NAME)
+        print(f"SERVICE_NAME: {SERVICE_NAME}")
+        print(f"  STATE: {state}")
+    except OSError as exc:
+        print(f"query -> {exc}")
 
 
 def main() -> int:
@@ -80,6 +100,13 @@ def main() -> int:
 
     p_install = sub.add_parser("install", help="Register the driver with SCM")
     p_install.add_argument("--sys", required=True, help="Path to AikKmdfIoctl.sys")
+    p_install.add_argument(
+        "--fast",
+        "--skip-testsigning-check",
+        dest="fast",
+        action="store_true",
+        help="Skip the bcdedit test-signing check",
+    )
 
     sub.add_parser("start", help="Start the driver service")
     sub.add_parser("stop", help="Stop the driver service")
@@ -89,7 +116,7 @@ def main() -> int:
     args = ap.parse_args()
 
     if args.action == "install":
-        install(args.sys)
+        install(args.sys, fast=args.fast)
     elif args.action == "start":
         start()
     elif args.action == "stop":
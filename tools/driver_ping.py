@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import argparse
 import ctypes
+import functools
+import threading
 from ctypes import wintypes
 
 
-kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-
 GENERIC_READ = 0x80000000
 GENERIC_WRITE = 0x40000000
 FILE_SHARE_READ = 0x00000001
@@ -24,42 +24,58 @@ def ctl_code(device_type: int, function: int, method: int, access: int) -> int:
 
 
 AIK_IOCTL_INDEX = 0x800
-IOCTL_AIK_PING = ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 0, METHOD_BUFFERED, FILE_ANY_ACCESS)
-IOCTL_AIK_ECHO = ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 1, METHOD_BUFFERED, FILE_ANY_ACCESS)
-
-
-CreateFileW = kernel32.CreateFileW
-CreateFileW.argtypes = [
-    wintypes.LPCWSTR,
-    wintypes.DWORD,
-    wintypes.DWORD,
-    wintypes.LPVOID,
-    wintypes.DWORD,
-    wintypes.DWORD,
-    wintypes.HANDLE,
-]
-CreateFileW.restype = wintypes.HANDLE
-
-DeviceIoControl = kernel32.DeviceIoControl
-DeviceIoControl.argtypes = [
-    wintypes.HANDLE,
-    wintypes.DWORD,
-    wintypes.LPVOID,
-    wintypes.DWORD,
-    wintypes.LPVOID,
-    wintypes.DWORD,
-    ctypes.POINTER(wintypes.DWORD),
-    wintypes.LPVOID,
-]
-DeviceIoControl.restype = wintypes.BOOL
-
-CloseHandle = kernel32.CloseHandle
-CloseHandle.argtypes = [wintypes.HANDLE]
-CloseHandle.restype = wintypes.BOOL
+IOCTL_AIK_PING = 0x00222000  # ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 0, METHOD_BUFFERED, FILE_ANY_ACCESS)
+IOCTL_AIK_ECHO = 0x00222004  # ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 1, METHOD_BUFFERED, FILE_ANY_ACCESS)
+
+
+@functools.cache
+def _kernel32() -> ctypes.WinDLL:
+    """Load kernel32 on first use so importing this module works off Windows."""
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+    kernel32.CreateFileW.argtypes = [
+        wintypes.LPCWSTR,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        wintypes.DWORD,
+        wintypes.HANDLE,
+    ]
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+
+    kernel32.DeviceIoControl.argtypes = [
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        wintypes.LPVOID,
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD),
+        wintypes.LPVOID,
+    ]
+    kernel32.DeviceIoControl.restype = wintypes.BOOL
+
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    return kernel32
+
+
+_TLS = threading.local()
+
+
+def _scratch(size: int) -> ctypes.Array:
+    """Return a zeroed per-thread output buffer of at least `size` bytes."""
+    buf = getattr(_TLS, "buf", None)
+    if buf is None or len(buf) < size:
+        buf = (ctypes.c_ubyte * max(size, 4096))()
+        _TLS.buf = buf
+    ctypes.memset(buf, 0, size)
+    return buf
 
 
 def open_device(path: str) -> wintypes.HANDLE:
-    h = CreateFileW(
+    h = _kernel32().CreateFileW(
         path,
         GENERIC_READ | GENERIC_WRITE,
         FILE_SHARE_READ | FILE_SHARE_WRITE,
@@ -74,17 +90,17 @@ def open_device(path: str) -> wintypes.HANDLE:
 
 
 def ioctl(h: wintypes.HANDLE, code: int, in_data: bytes = b"", out_size: int = 256) -> bytes:
-    in_buf = (ctypes.c_ubyte * max(1, len(in_data)))()
-    for i, b in enumerate(in_data):
-        in_buf[i] = b
+    n = len(in_data)
+    in_buf = (ctypes.c_ubyte * max(1, n))()
+    ctypes.memmove(in_buf, in_data, n)
 
-    out_buf = (ctypes.c_ubyte * out_size)()
+    out_buf = _scratch(out_size)
     returned = wintypes.DWORD(0)
-    ok = DeviceIoControl(
+    ok = _kernel32().DeviceIoControl(
         h,
         code,
         ctypes.byref(in_buf),
-        len(in_data),
+        n,
         ctypes.byref(out_buf),
         out_size,
         ctypes.byref(returned),
@@ -92,12 +108,12 @@ def ioctl(h: wintypes.HANDLE, code: int, in_data: bytes = b"", out_size: int = 2
     )
     if not ok:
         raise ctypes.WinError(ctypes.get_last_error())
-    return bytes(out_buf[: returned.value])
+    return ctypes.string_at(out_buf, returned.value)
 
 
 # New IOCTL codes for scancode injection
-IOCTL_AIK_INJECT_SCANCODE = ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 2, METHOD_BUFFERED, FILE_ANY_ACCESS)
-IOCTL_AIK_INJECT_SCANCODES = ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 3, METHOD_BUFFERED, FILE_ANY_ACCESS)
+IOCTL_AIK_INJECT_SCANCODE = 0x00222008  # ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 2, METHOD_BUFFERED, FILE_ANY_ACCESS)
+IOCTL_AIK_INJECT_SCANCODES = 0x0022200C  # ctl_code(FILE_DEVICE_UNKNOWN, AIK_IOCTL_INDEX + 3, METHOD_BUFFERED, FILE_ANY_ACCESS)
 
 # Scancode flags
 AIK_KEY_DOWN = 0x00
@@ -118,7 +134,7 @@ def test_inject_scancode(h: wintypes.HANDLE, scancode: int, is_down: bool = True
     in_buf = (ctypes.c_ubyte * len(data))(*data)
     returned = wintypes.DWORD(0)
     
-    ok = DeviceIoControl(
+    ok = _kernel32().DeviceIoControl(
         h,
         IOCTL_AIK_INJECT_SCANCODE,
         ctypes.byref(in_buf),
@@ -159,7 +175,7 @@ def main() -> int:
             else:
                 print("INJECT scancode 0x1E (A) UP -> FAILED")
     finally:
-        CloseHandle(h)
+        _kernel32().CloseHandle(h)
     return 0
 
 
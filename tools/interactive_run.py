@@ -29,12 +29,11 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     return p.parse_args(argv)
 
 
-def build_command(args: argparse.Namespace, goal: str, dry_run: bool) -> list[str]:
+def build_base_command(args: argparse.Namespace) -> list[str]:
+    """Arguments that stay the same for every goal in the session."""
     cmd = [
         args.python,
         "main.py",
-        "--goal",
-        goal,
         "--max-steps",
         str(args.max_steps),
         "--interval",
@@ -54,8 +53,6 @@ def build_command(args: argparse.Namespace, goal: str, dry_run: bool) -> list[st
         "--learning",
         args.learning,
     ]
-    if dry_run:
-        cmd.append("--dry-run")
     if args.no_overlay:
         cmd.append("--no-overlay")
     else:
@@ -65,6 +62,13 @@ def build_command(args: argparse.Namespace, goal: str, dry_run: bool) -> list[st
     return cmd
 
 
+def build_command(base_cmd: list[str], goal: str, dry_run: bool) -> list[str]:
+    cmd = [*base_cmd, "--goal", goal]
+    if dry_run:
+        cmd.append("--dry-run")
+    return cmd
+
+
 def main(argv: list[str]) -> int:
     load_dotenv()
     args = parse_args(argv)
@@ -73,6 +77,7 @@ def main(argv: list[str]) -> int:
         print("Missing ANTHROPIC_API_KEY in environment/.env", file=sys.stderr)
         return 2
 
+    base_cmd = build_base_command(args)
     dry_run = args.dry_run_start
     if args.live:
         dry_run = False
@@ -108,7 +113,7 @@ def main(argv: list[str]) -> int:
             print(f"Current mode: {mode_name()}")
             continue
 
-        cmd = build_command(args, goal, dry_run)
+        cmd = build_command(base_cmd, goal, dry_run)
         print(f"Mode: {mode_name()}")
         print("Running:", " ".join(shlex.quote(c) for c in cmd))
         proc = subprocess.run(cmd, check=False)
@@ -1,20 +1,123 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import codecs
+import ctypes
+import functools
+import inspect
+import io
 import json
+import locale
 import os
+import queue
 import re
 import subprocess
 import sys
-import tempfile
+import threading
 import time
-import urllib.parse
+from concurrent.futures import Future, wait
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import quote_plus
 
 import httpx
-import speech_recognition as sr
 from dotenv import find_dotenv, load_dotenv
-from pynput.keyboard import Controller
+
+if TYPE_CHECKING:
+    import speech_recognition as sr
+    from pynput.keyboard import Controller
+
+try:
+    import pyperclip
+except ImportError:  # optional: long text is typed key by key instead of pasted
+    pyperclip = None
+
+_RE_WS = re.compile(r"\s+")
+_RE_SONG = re.compile(r"(?:play(?: the)?(?: song)?\s+)(.+)$")
+_RE_SPLIT_CONJ = re.compile(r"\b(?:and then|then|after that|aur phir|phir)\b|,")
+_RE_JSON = re.compile(r"\{[\s\S]*\}")
+_RE_FILLERS = re.compile(r"\b(?:right now|now|please)\b")
+# A single whitespace-free token containing a dot, e.g. "github.com".
+_RE_DOMAIN = re.compile(r"\S*\.\S*")
+# Markers of a multi-step request, matched as substrings of the space-padded text.
+_RE_MULTISTEP = re.compile("|".join(map(re.escape, (
+    " and then ",
+    " then ",
+    " after that ",
+    " save ",
+    " email ",
+    " send ",
+    "type in",
+    "write in",
+    "fill ",
+    "aur phir",
+    "phir",
+))))
+
+_DIRECT_MAP = {
+    "show files": "dir",
+    "list files": "dir",
+    "list file": "dir",
+    "files dikhao": "dir",
+    "folder dikhao": "dir",
+    "clear terminal": "cls",
+    "clear": "cls",
+    "terminal saaf karo": "cls",
+    "who am i": "whoami",
+    "mai kaun hu": "whoami",
+    "python version": "python --version",
+    "go back": "cd ..",
+    "piche jao": "cd ..",
+    "peeche jao": "cd ..",
+}
+
+_APP_MAP = {
+    "spotify": "start spotify:",
+    "excel": "start excel",
+    "excel file": "start excel",
+    "notepad": "start notepad",
+    "chrome": "start chrome",
+    "calculator": "start calc",
+    "cmd": "start cmd",
+    "powershell": "start powershell",
+    "explorer": "start explorer",
+}
+
+# One match over the lowercased phrase, tried in order: an exact
+# _DIRECT_MAP phrase, "open/start spotify" anywhere, then the leftmost
+# "open/start <target>". No IGNORECASE since the input is already lowercase.
+_RE_PHRASE = re.compile(
+    r"(?P<direct>(?:%s))$"
+    r"|(?P<spotify>.*?(?:open|start) spotify)"
+    r"|.*?(?:^|\b)(?:open|start)\s+(?P<target>.+)$"
+    % "|".join(map(re.escape, sorted(_DIRECT_MAP, key=len, reverse=True)))
+)
+
+_KNOWN_CMDS = frozenset({
+    "dir", "cd", "cls", "echo", "python", "pip", "git", "whoami",
+    "ipconfig", "hostname", "start", "notepad", "code", "type",
+})
+
+_DANGEROUS_TOKENS = (
+    "del ",
+    " erase ",
+    "rmdir",
+    "rd ",
+    "format",
+    "shutdown",
+    "restart-computer",
+    "stop-computer",
+    "remove-item",
+    "reg delete",
+    "diskpart",
+    "bcdedit",
+)
+_CHAIN_OPERATORS = ("&&", "||", ";")
+# Exact commands known to be harmless skip the scan entirely.
+_SAFE_COMMANDS = frozenset(_DIRECT_MAP.values()) | {"ipconfig", "hostname", "git status", "pip list"}
+# Dangerous tokens and chaining operators, found in one substring search.
+_RE_DANGEROUS = re.compile("|".join(map(re.escape, _DANGEROUS_TOKENS + _CHAIN_OPERATORS)))
 
 
 def parse_args(argv: list[str]) -> argparse.Namespace:
@@ -38,6 +141,36 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         default=8.0,
         help="Seconds to wait for speech before retry",
     )
+    parser.add_argument(
+        "--pause-threshold",
+        type=float,
+        default=0.4,
+        help="Seconds of trailing silence that end a phrase (speech_recognition default: 0.8)",
+    )
+    parser.add_argument(
+        "--non-speaking-duration",
+        type=float,
+        default=0.2,
+        help="Seconds of silence kept around a phrase; must not exceed --pause-threshold",
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=16000,
+        help="Microphone capture rate in Hz (16 kHz is what the STT providers expect)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=512,
+        help="Frames per microphone buffer; smaller means lower capture latency",
+    )
+    parser.add_argument(
+        "--energy-threshold",
+        type=float,
+        default=None,
+        help="Fixed mic energy threshold (default: calibrate from ambient noise)",
+    )
     parser.add_argument(
         "--enter",
         action="store_true",
@@ -139,21 +272,24 @@ def resolve_language_codes(args: argparse.Namespace) -> list[str]:
     return deduped or ["en-IN"]
 
 
+_SARVAM_TEXT_KEYS = ("transcript", "text", "output_text")
+
+
 def _extract_sarvam_text(response: object) -> str:
     if response is None:
         return ""
     if isinstance(response, str):
         return response.strip()
     if isinstance(response, dict):
-        for key in ("transcript", "text", "output_text"):
-            value = response.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-        return ""
-    for key in ("transcript", "text", "output_text"):
-        value = getattr(response, key, None)
-        if isinstance(value, str) and value.strip():
-            return value.strip()
+        getter = response.get
+    else:
+        getter = lambda key: getattr(response, key, None)
+    for key in _SARVAM_TEXT_KEYS:
+        value = getter(key)
+        if isinstance(value, str):
+            stripped = value.strip()
+            if stripped:
+                return stripped
     return ""
 
 
@@ -161,6 +297,18 @@ def _sarvam_transcribe_with_kwargs(sarvam_client: object, file_handle: object, *
     return sarvam_client.speech_to_text.transcribe(file=file_handle, **kwargs)
 
 
+@functools.lru_cache(maxsize=8)
+def _transcribe_params(transcribe: object) -> frozenset[str] | None:
+    """Keyword names transcribe() accepts, or None if it can't be narrowed."""
+    try:
+        params = inspect.signature(transcribe).parameters
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        return None
+    return frozenset(params)
+
+
 def _try_sarvam_transcribe(
     sarvam_client: object,
     file_handle: object,
@@ -168,6 +316,16 @@ def _try_sarvam_transcribe(
     mode: str,
     language_code: str,
 ) -> object:
+    supported = _transcribe_params(sarvam_client.speech_to_text.transcribe)
+    if supported is not None and "model" in supported:
+        desired = {"model": model, "mode": mode, "language_code": language_code}
+        kwargs = {k: v for k, v in desired.items() if k in supported}
+        try:
+            file_handle.seek(0)
+            return _sarvam_transcribe_with_kwargs(sarvam_client, file_handle, **kwargs)
+        except TypeError:
+            pass
+
     attempts = (
         {"model": model, "mode": mode, "language_code": language_code},
         {"model": model, "mode": mode},
@@ -198,21 +356,51 @@ def _try_sarvam_transcribe(
     raise RuntimeError("No valid Sarvam transcription method found.")
 
 
-def recognize_once(
+# Untimed lock waits can't be interrupted by Ctrl+C on Windows (bpo-29971),
+# so the main thread waits in short slices instead.
+_POLL_INTERVAL = 0.25
+
+
+def next_transcription(pending: queue.Queue, args: argparse.Namespace) -> Future | None:
+    """Block until the next captured phrase has been handed to the STT worker.
+
+    Returns None once the microphone listener has stopped. Continuous mode
+    waits indefinitely; single-shot mode gives up after --timeout plus the
+    longest possible phrase (the time limit and its trailing pause), like a
+    timed-out listen().
+    """
+    import speech_recognition as sr
+
+    deadline = None
+    if not args.continuous:
+        deadline = time.monotonic() + args.timeout + args.phrase_time_limit + args.pause_threshold
+    while True:
+        timeout = _POLL_INTERVAL
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        try:
+            return pending.get(timeout=timeout)
+        except queue.Empty:
+            continue
+
+
+def wait_result(future: Future) -> object:
+    """Future.result() that stays interruptible by Ctrl+C."""
+    while not wait((future,), timeout=_POLL_INTERVAL).done:
+        pass
+    return future.result()
+
+
+def transcribe_audio(
     recognizer: sr.Recognizer,
-    mic: sr.Microphone,
+    audio: sr.AudioData,
     args: argparse.Namespace,
     sarvam_client: object | None,
+    language_codes: list[str],
 ) -> str | None:
-    with mic as source:
-        print("Listening... speak now")
-        audio = recognizer.listen(
-            source,
-            timeout=args.timeout,
-            phrase_time_limit=args.phrase_time_limit,
-        )
-
-    language_codes = resolve_language_codes(args)
+    import speech_recognition as sr
 
     if args.provider == "google":
         for code in language_codes:
@@ -228,39 +416,217 @@ def recognize_once(
     if sarvam_client is None:
         raise RuntimeError("Sarvam client is not initialized.")
 
-    wav_data = audio.get_wav_data()
-    tmp_path: Path | None = None
+    # Sarvam resamples to 16 kHz/16-bit server-side; converting here shrinks the upload.
+    # WAV rather than FLAC: get_flac_data spawns the flac encoder per phrase,
+    # which costs more latency than the ~16 KB/s it saves at 16 kHz mono.
+    wav_data = audio.get_wav_data(convert_rate=16000, convert_width=2)
+    buf = io.BytesIO(wav_data)
+    buf.name = "audio.wav"  # the SDK derives the upload filename/MIME type from this
+    return _transcribe_sarvam_file(sarvam_client, buf, args, language_codes)
+
+
+def _transcribe_sarvam_file(
+    sarvam_client: object,
+    file_handle: object,
+    args: argparse.Namespace,
+    language_codes: list[str],
+) -> str | None:
+    for code in language_codes:
+        response = _try_sarvam_transcribe(
+            sarvam_client=sarvam_client,
+            file_handle=file_handle,
+            model=args.sarvam_model,
+            mode=args.sarvam_mode,
+            language_code=code,
+        )
+        text = _extract_sarvam_text(response)
+        if text:
+            return text
+    return None
+
+
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _INPUT_KEYBOARD = 1
+    _KEYEVENTF_KEYUP = 0x0002
+    _KEYEVENTF_UNICODE = 0x0004
+
+    class _MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+    class _INPUT(ctypes.Structure):
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    _SendInput = ctypes.WinDLL("user32", use_last_error=True).SendInput
+    _SendInput.argtypes = (wintypes.UINT, ctypes.POINTER(_INPUT), ctypes.c_int)
+    _SendInput.restype = wintypes.UINT
+
+    def _type_win_fast(text: str) -> None:
+        """Send the whole string as one SendInput batch of Unicode key events."""
+        raw = text.encode("utf-16-le")
+        units = [int.from_bytes(raw[i:i + 2], "little") for i in range(0, len(raw), 2)]
+        n = 2 * len(units)
+        arr = (_INPUT * n)()
+        for i, unit in enumerate(units):
+            down, up = arr[2 * i], arr[2 * i + 1]
+            down.type = up.type = _INPUT_KEYBOARD
+            down.ki.wScan = up.ki.wScan = unit
+            down.ki.dwFlags = _KEYEVENTF_UNICODE
+            up.ki.dwFlags = _KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP
+        # Only a wholesale rejection (e.g. UIPI) is retried, so nothing gets typed twice.
+        if _SendInput(n, arr, ctypes.sizeof(_INPUT)) == 0:
+            raise OSError(f"SendInput rejected input (GetLastError={ctypes.get_last_error()}).")
+else:
+    _type_win_fast = None
+
+
+# Text longer than this is pasted (when pyperclip is available) instead of
+# being synthesized one key event at a time.
+_PASTE_MIN_CHARS = 40
+
+
+def _paste(text: str, keyboard: Controller) -> None:
+    from pynput.keyboard import Key
+
+    if sys.platform == "darwin":
+        modifiers = (Key.cmd,)
+    elif sys.platform == "win32":
+        modifiers = (Key.ctrl,)
+    else:
+        # Linux terminal emulators reserve plain Ctrl+V for literal input.
+        modifiers = (Key.ctrl, Key.shift)
+
+    previous = pyperclip.paste()
+    pyperclip.copy(text)
     try:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-            temp_file.write(wav_data)
-            tmp_path = Path(temp_file.name)
-
-        with tmp_path.open("rb") as file_handle:
-            for code in language_codes:
-                response = _try_sarvam_transcribe(
-                    sarvam_client=sarvam_client,
-                    file_handle=file_handle,
-                    model=args.sarvam_model,
-                    mode=args.sarvam_mode,
-                    language_code=code,
-                )
-                text = _extract_sarvam_text(response)
-                if text:
-                    return text
-        return None
+        with keyboard.pressed(*modifiers):
+            keyboard.press("v")
+            keyboard.release("v")
+        # Give the target window time to read the clipboard before restoring it.
+        time.sleep(0.1)
     finally:
-        if tmp_path is not None and tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
+        pyperclip.copy(previous)
 
 
 def type_to_terminal(text: str, keyboard: Controller, with_enter: bool) -> None:
-    keyboard.type(text)
+    # Control characters need real key presses, so leave them to pynput.
+    if _type_win_fast is not None and text.isprintable():
+        try:
+            _type_win_fast(text)
+        except OSError:
+            keyboard.type(text)
+    elif pyperclip is not None and len(text) > _PASTE_MIN_CHARS:
+        try:
+            _paste(text, keyboard)
+        except pyperclip.PyperclipException:
+            keyboard.type(text)
+    else:
+        keyboard.type(text)
     if with_enter:
         keyboard.press("\n")
         keyboard.release("\n")
 
 
+_IS_WINDOWS = sys.platform == "win32"
+_SHELL_SENTINEL = "__AIK_DONE__"
+# The shared shell's stdin is the command pipe, so each command gets its
+# stdin cut off; anything that still wants to read it sees EOF at once.
+_SHELL_NULL_STDIN = "< nul" if _IS_WINDOWS else "< /dev/null"
+# Only known non-interactive commands go through the shared shell. Anything
+# else (REPLs, prompts, pagers, coloured/progress output, detached windows,
+# the agent loop) keeps its own process attached to the real console.
+# "cd .." is excluded too: it would move only the shared shell, not the
+# commands that run in their own process.
+_SHARED_SHELL_CMDS = _SAFE_COMMANDS - {"cls", "cd .."}
+
+_SHARED_SHELL: subprocess.Popen | None = None
+
+
+def _kill_shared_shell() -> None:
+    if _SHARED_SHELL is not None:
+        _SHARED_SHELL.kill()
+
+
+atexit.register(_kill_shared_shell)
+
+
+@functools.cache
+def _shell_encoding() -> str:
+    """Encoding of the shared shell's piped output.
+
+    cmd.exe built-ins write to a pipe in the console (OEM) code page, not UTF-8.
+    """
+    if _IS_WINDOWS:
+        encoding = f"cp{ctypes.windll.kernel32.GetConsoleOutputCP()}"
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:  # no console (cp0) or a code page Python lacks
+            pass
+    return locale.getpreferredencoding(False)
+
+
+def _shared_shell() -> subprocess.Popen:
+    """Return a long-lived shell, respawning it if it has exited."""
+    global _SHARED_SHELL
+    if _SHARED_SHELL is None or _SHARED_SHELL.poll() is not None:
+        argv = ["cmd.exe", "/D", "/Q", "/K"] if _IS_WINDOWS else ["/bin/sh"]
+        _SHARED_SHELL = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        # Swallow the cmd.exe banner before the first real command.
+        _shell_exec(_SHARED_SHELL, "", echo_output=False)
+    return _SHARED_SHELL
+
+
+def _shell_exec(shell: subprocess.Popen, command: str, echo_output: bool = True) -> int:
+    status = "%errorlevel%" if _IS_WINDOWS else "$?"
+    line = f"{command} {_SHELL_NULL_STDIN}\n" if command else "\n"
+    shell.stdin.write(f"{line}echo {_SHELL_SENTINEL}:{status}\n".encode())
+    shell.stdin.flush()
+    while True:
+        line = shell.stdout.readline()
+        if not line:
+            # The command ended the shell itself (e.g. "exit").
+            return shell.wait()
+        text = line.decode(_shell_encoding(), errors="replace").rstrip("\r\n")
+        if text.startswith(f"{_SHELL_SENTINEL}:"):
+            code = text.partition(":")[2].strip()
+            return int(code) if code.lstrip("-").isdigit() else 1
+        if echo_output:
+            print(text)
+
+
 def run_terminal_command(command: str) -> int:
+    if command.strip().lower() in _SHARED_SHELL_CMDS:
+        try:
+            return _shell_exec(_shared_shell(), command.strip())
+        except OSError:
+            pass
     completed = subprocess.run(command, shell=True)
     return completed.returncode
 
@@ -270,77 +636,48 @@ def is_safe_command(command: str) -> bool:
     if not stripped:
         return False
 
-    dangerous_tokens = (
-        "del ",
-        " erase ",
-        "rmdir",
-        "rd ",
-        "format",
-        "shutdown",
-        "restart-computer",
-        "stop-computer",
-        "remove-item",
-        "reg delete",
-        "diskpart",
-        "bcdedit",
-    )
-    if any(token in f" {stripped} " for token in dangerous_tokens):
-        return False
-
-    if any(op in command for op in ("&&", "||", ";")):
-        return False
+    if stripped in _SAFE_COMMANDS:
+        return True
 
-    return True
+    return _RE_DANGEROUS.search(f" {stripped} ") is None
 
 
 def _normalize_spoken_text(text: str) -> str:
-    text = text.strip()
-    text = re.sub(r"\s+", " ", text)
-    return text.rstrip(".?!").strip()
+    # split() drops leading/trailing whitespace and collapses runs in one pass;
+    # the final rstrip() catches a space left by trailing punctuation ("hi .").
+    return " ".join(text.split()).rstrip(".?!").rstrip()
 
 
 def _extract_song_query(lower_text: str) -> str | None:
-    match = re.search(r"(?:play(?: the)?(?: song)?\s+)(.+)$", lower_text)
+    match = _RE_SONG.search(lower_text)
     if not match:
         return None
     query = match.group(1).strip(" .?!")
-    fillers = {
-        "right now",
-        "now",
-        "please",
-    }
-    for filler in fillers:
-        query = query.replace(filler, " ")
-    query = re.sub(r"\s+", " ", query).strip()
+    query = _RE_FILLERS.sub(" ", query)
+    query = _RE_WS.sub(" ", query).strip()
     return query or None
 
 
 def _is_complex_multistep_intent(lower_text: str) -> bool:
-    markers = (
-        " and then ",
-        " then ",
-        " after that ",
-        " save ",
-        " email ",
-        " send ",
-        "type in",
-        "write in",
-        "fill ",
-        "aur phir",
-        "phir",
-    )
-    wrapped = f" {lower_text} "
-    return any(marker in wrapped for marker in markers)
+    return _RE_MULTISTEP.search(f" {lower_text} ") is not None
+
+
+_MAIN_PY_PATH = Path(__file__).resolve().parents[1] / "main.py"
+_MAIN_PY_EXISTS = _MAIN_PY_PATH.exists()
+# The goal is passed inside double quotes, where cmd.exe already treats ^ & |
+# literally; caret-escaping them would leave stray carets in the goal text.
+_GOAL_ESCAPE_TABLE = str.maketrans({'"': '\\"'})
 
 
 def _build_agent_delegate_command(goal_text: str) -> str | None:
-    main_path = Path(__file__).resolve().parents[1] / "main.py"
-    if not main_path.exists():
+    if not _MAIN_PY_EXISTS:
         return None
-    escaped_goal = goal_text.replace('"', '\\"')
-    return f'python "{main_path}" --goal "{escaped_goal}"'
+    escaped_goal = goal_text.translate(_GOAL_ESCAPE_TABLE)
+    return f'python "{_MAIN_PY_PATH}" --goal "{escaped_goal}"'
 
 
+# Pure in its arguments, and users repeat the same few phrases.
+@functools.lru_cache(maxsize=256)
 def spoken_phrase_to_command(text: str, delegate_to_agent: bool = True) -> str | None:
     normalized = _normalize_spoken_text(text)
     lower = normalized.lower()
@@ -350,79 +687,95 @@ def spoken_phrase_to_command(text: str, delegate_to_agent: bool = True) -> str |
         if delegated:
             return delegated
 
-    direct_map = {
-        "show files": "dir",
-        "list files": "dir",
-        "list file": "dir",
-        "files dikhao": "dir",
-        "folder dikhao": "dir",
-        "clear terminal": "cls",
-        "clear": "cls",
-        "terminal saaf karo": "cls",
-        "who am i": "whoami",
-        "mai kaun hu": "whoami",
-        "python version": "python --version",
-        "go back": "cd ..",
-        "piche jao": "cd ..",
-        "peeche jao": "cd ..",
-    }
-    if lower in direct_map:
-        return direct_map[lower]
+    match = _RE_PHRASE.match(lower)
+    if match and match["direct"]:
+        return _DIRECT_MAP[match["direct"]]
 
-    if "open spotify" in lower or "start spotify" in lower:
+    if match and match["spotify"]:
         song_query = _extract_song_query(lower)
         if song_query:
-            encoded_query = urllib.parse.quote_plus(song_query)
+            encoded_query = quote_plus(song_query)
             return f'start "" "https://open.spotify.com/search/{encoded_query}"'
         return "start spotify:"
 
-    open_match = re.search(r"(?:^|\b)(?:open|start)\s+(.+)$", normalized, flags=re.IGNORECASE)
-    if open_match:
-        target = open_match.group(1).strip()
-        target = re.split(r"\b(?:and then|then|after that|aur phir|phir)\b|,", target, maxsplit=1, flags=re.IGNORECASE)[0].strip()
-        if not target:
+    if match:
+        start, end = match.span("target")
+        conj = _RE_SPLIT_CONJ.search(lower, start, end)
+        if conj:
+            end = conj.start()
+        target_lower = lower[start:end].strip()
+        if not target_lower:
             return None
+        # Offsets carry over to the original-case text unless lower() changed its length.
+        target = normalized[start:end].strip() if len(normalized) == len(lower) else target_lower
+
+        if target_lower in _APP_MAP:
+            return _APP_MAP[target_lower]
 
-        target_lower = target.lower()
-        app_map = {
-            "spotify": "start spotify:",
-            "excel": "start excel",
-            "excel file": "start excel",
-            "notepad": "start notepad",
-            "chrome": "start chrome",
-            "calculator": "start calc",
-            "cmd": "start cmd",
-            "powershell": "start powershell",
-            "explorer": "start explorer",
-        }
-        if target_lower in app_map:
-            return app_map[target_lower]
-
-        if target_lower.startswith("http://") or target_lower.startswith("https://"):
+        if target_lower.startswith(("http://", "https://")):
             return f'start "" "{target}"'
 
-        if "." in target_lower and " " not in target_lower:
+        if _RE_DOMAIN.fullmatch(target_lower):
             return f'start "" "https://{target}"'
 
         if len(target.split()) <= 3:
             return f'start "" "{target}"'
         return None
 
-    first_token = lower.split(" ", 1)[0]
-    known_cmds = {
-        "dir", "cd", "cls", "echo", "python", "pip", "git", "whoami",
-        "ipconfig", "hostname", "start", "notepad", "code", "type",
-    }
-    if first_token in known_cmds:
+    first_token = lower.partition(" ")[0]
+    if first_token in _KNOWN_CMDS:
         return normalized
 
     return None
 
 
+def _create_sarvam_client(api_key: str) -> object:
+    """Import and build the Sarvam SDK client.
+
+    The SDK's own httpx client already keeps connections alive across calls.
+    """
+    from sarvamai import SarvamAI
+
+    return SarvamAI(api_subscription_key=api_key)
+
+
+_ANTHROPIC_CLIENT: httpx.Client | None = None
+
+
+def _get_anthropic_client() -> httpx.Client:
+    """Return a process-wide client so keep-alive reuses the TLS connection."""
+    global _ANTHROPIC_CLIENT
+    if _ANTHROPIC_CLIENT is None:
+        _ANTHROPIC_CLIENT = httpx.Client(
+            timeout=20.0,
+            headers={
+                "anthropic-version": "2023-06-01",
+                "content-type": "application/json",
+            },
+        )
+        atexit.register(_ANTHROPIC_CLIENT.close)
+    return _ANTHROPIC_CLIENT
+
+
+_ANTHROPIC_API_KEY = ""
+
+
 def ai_spoken_phrase_to_command(text: str, anthropic_api_key: str, model: str) -> str | None:
-    if not anthropic_api_key.strip():
+    global _ANTHROPIC_API_KEY
+    api_key = anthropic_api_key.strip()
+    if not api_key:
         return None
+    if api_key != _ANTHROPIC_API_KEY:
+        _ANTHROPIC_API_KEY = api_key
+        _ai_lookup.cache_clear()
+    # Not lowercased: the model needs the original casing for echo text,
+    # URLs and paths.
+    return _ai_lookup(_normalize_spoken_text(text), model)
 
+
+@functools.lru_cache(maxsize=256)
+def _ai_lookup(text: str, model: str) -> str | None:
+    """Map normalized speech to a command; None results are cached too."""
     system_prompt = (
         "You convert spoken Hinglish/Hindi/English intent into ONE safe Windows terminal command. "
         "Return strict JSON only: {\"command\": string, \"execute\": boolean}. "
@@ -446,16 +799,14 @@ def ai_spoken_phrase_to_command(text: str, anthropic_api_key: str, model: str) -
             {"role": "user", "content": user_prompt},
         ],
     }
-    headers = {
-        "x-api-key": anthropic_api_key,
-        "anthropic-version": "2023-06-01",
-        "content-type": "application/json",
-    }
-
-    with httpx.Client(timeout=20.0) as client:
-        response = client.post("https://api.anthropic.com/v1/messages", headers=headers, json=payload)
-        response.raise_for_status()
-        data = response.json()
+    client = _get_anthropic_client()
+    response = client.post(
+        "https://api.anthropic.com/v1/messages",
+        headers={"x-api-key": _ANTHROPIC_API_KEY},
+        json=payload,
+    )
+    response.raise_for_status()
+    data = json.loads(response.content)
 
     content = data.get("content", [])
     text_parts: list[str] = []
@@ -469,14 +820,17 @@ def ai_spoken_phrase_to_command(text: str, anthropic_api_key: str, model: str) -
     if not raw:
         return None
 
-    match = re.search(r"\{[\s\S]*\}", raw)
-    if not match:
-        return None
-
     try:
-        obj = json.loads(match.group(0))
+        obj = json.loads(raw)
     except json.JSONDecodeError:
-        return None
+        # The model sometimes wraps the JSON in prose; fall back to extracting it.
+        match = _RE_JSON.search(raw)
+        if not match:
+            return None
+        try:
+            obj = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return None
 
     if not isinstance(obj, dict):
         return None
@@ -496,11 +850,21 @@ def ai_spoken_phrase_to_command(text: str, anthropic_api_key: str, model: str) -
 def main(argv: list[str]) -> int:
     load_dotenv(find_dotenv(usecwd=True))
     args = parse_args(argv)
+    # Imported after argument parsing so --help doesn't pay for PyAudio/pynput setup.
+    import speech_recognition as sr
+    from pynput.keyboard import Controller
+
     recognizer = sr.Recognizer()
+    recognizer.pause_threshold = args.pause_threshold
+    recognizer.non_speaking_duration = min(args.non_speaking_duration, args.pause_threshold)
+    if args.energy_threshold is not None:
+        recognizer.dynamic_energy_threshold = False
+        recognizer.energy_threshold = args.energy_threshold
     keyboard = Controller()
     sarvam_client = None
     anthropic_api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
 
+    api_key = ""
     if args.provider == "sarvam":
         api_key = (args.sarvam_api_key or "").strip() or os.getenv("SARVAM_API_KEY", "").strip()
         if not api_key:
@@ -509,16 +873,9 @@ def main(argv: list[str]) -> int:
                 file=sys.stderr,
             )
             return 2
-        try:
-            from sarvamai import SarvamAI
-
-            sarvam_client = SarvamAI(api_subscription_key=api_key)
-        except Exception as exc:
-            print(f"Failed to initialize Sarvam SDK: {exc}", file=sys.stderr)
-            return 2
 
     try:
-        mic = sr.Microphone()
+        mic = sr.Microphone(sample_rate=args.sample_rate, chunk_size=args.chunk_size)
     except Exception as exc:
         print(
             "Microphone init failed. Install and verify audio input device."
@@ -527,22 +884,120 @@ def main(argv: list[str]) -> int:
         )
         return 2
 
-    with mic as source:
+    # Calibration only samples the microphone, so it runs while the Sarvam
+    # SDK is imported and its client set up. An explicit threshold would be
+    # overwritten by calibration, so it is skipped then.
+    calib_errors: list[Exception] = []
+
+    def calibrate() -> None:
+        try:
+            with mic as source:
+                recognizer.adjust_for_ambient_noise(source, duration=0.8)
+        except Exception as exc:
+            calib_errors.append(exc)
+
+    calib = None
+    if args.energy_threshold is None:
         print("Calibrating ambient noise...")
-        recognizer.adjust_for_ambient_noise(source, duration=0.8)
+        calib = threading.Thread(target=calibrate, name="calibrate", daemon=True)
+        calib.start()
+
+    if api_key:
+        try:
+            sarvam_client = _create_sarvam_client(api_key)
+        except Exception as exc:
+            print(f"Failed to initialize Sarvam SDK: {exc}", file=sys.stderr)
+            if calib is not None:
+                calib.join()
+            return 2
+
+    if calib is not None:
+        calib.join()
+        if calib_errors:
+            raise calib_errors[0]
 
     language_codes = resolve_language_codes(args)
     print("Ready. Keep this terminal focused while typing is injected.")
     print(f"Languages: {', '.join(language_codes)}")
+    ai_enabled = bool(args.run_command and args.ai_command_map and anthropic_api_key)
+    ai_model = args.ai_model
     if args.run_command:
-        ai_status = "enabled" if args.ai_command_map and anthropic_api_key else "disabled"
+        ai_status = "enabled" if ai_enabled else "disabled"
         print(f"AI command mapping: {ai_status}")
     print("Press Ctrl+C to stop.")
 
+    # Consecutive failed transcriptions; backs off the next attempt so an
+    # STT outage isn't hammered once per phrase.
+    fail_streak = 0
+
+    def transcribe_job(audio: sr.AudioData) -> str | None:
+        if fail_streak:
+            time.sleep(min(0.05 * 2 ** fail_streak, 2.0))
+        return transcribe_audio(recognizer, audio, args, sarvam_client, language_codes)
+
+    # Phrases are transcribed as soon as they are captured, overlapping the
+    # STT round-trip with typing/command execution of the previous phrase.
+    # A single worker keeps results in capture order. It is a daemon thread
+    # rather than a ThreadPoolExecutor, whose workers are joined at
+    # interpreter exit and would hold Ctrl+C until an in-flight request ends.
+    stopping = threading.Event()
+    # Set while a phrase is being acted on. Phrases finished in that window
+    # are dropped, as they were when the mic was closed during a command;
+    # otherwise everything said during a long agent run would be executed
+    # afterwards.
+    acting = threading.Event()
+    jobs: queue.Queue[tuple[Future, sr.AudioData] | None] = queue.Queue()
+    pending: queue.Queue[Future | None] = queue.Queue()
+    listener_errors: list[Exception] = []
+
+    def stt_worker() -> None:
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            future, audio = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(transcribe_job(audio))
+            except Exception as exc:
+                future.set_exception(exc)
+
+    def listen_loop() -> None:
+        # Recognizer.listen_in_background's loop, except that a failing
+        # microphone is reported to the main loop (a None in pending) instead
+        # of silently ending the thread.
+        try:
+            with mic as source:
+                while not stopping.is_set():
+                    try:
+                        audio = recognizer.listen(source, 1, args.phrase_time_limit)
+                    except sr.WaitTimeoutError:
+                        continue
+                    if stopping.is_set():
+                        break
+                    if acting.is_set():
+                        continue
+                    future: Future = Future()
+                    jobs.put((future, audio))
+                    pending.put(future)
+        except Exception as exc:
+            listener_errors.append(exc)
+            pending.put(None)
+
+    worker = threading.Thread(target=stt_worker, name="stt", daemon=True)
+    worker.start()
+    threading.Thread(target=listen_loop, name="listen", daemon=True).start()
+
     try:
         while True:
+            print("Listening... speak now")
             try:
-                text = recognize_once(recognizer, mic, args, sarvam_client)
+                future = next_transcription(pending, args)
+                if future is None:
+                    print(f"Microphone listener stopped: {listener_errors[0]}", file=sys.stderr)
+                    return 2
+                text = wait_result(future)
             except sr.WaitTimeoutError:
                 print("No speech detected in time window. Retrying...")
                 if args.continuous:
@@ -558,25 +1013,29 @@ def main(argv: list[str]) -> int:
                 return 3
             except Exception as exc:
                 print(f"Transcription failed: {exc}", file=sys.stderr)
+                fail_streak += 1
                 if args.continuous:
                     continue
                 return 3
 
             if not text:
                 print("Recognized empty text.")
+                fail_streak += 1
                 if args.continuous:
                     continue
                 return 1
+            fail_streak = 0
 
             print(f"Recognized: {text}")
+            acting.set()
             if args.countdown > 0:
                 time.sleep(args.countdown)
 
             if args.run_command:
                 command = spoken_phrase_to_command(text, delegate_to_agent=args.delegate_to_agent)
-                if not command and args.ai_command_map and anthropic_api_key:
+                if not command and ai_enabled:
                     try:
-                        command = ai_spoken_phrase_to_command(text, anthropic_api_key, args.ai_model)
+                        command = ai_spoken_phrase_to_command(text, anthropic_api_key, ai_model)
                     except Exception as exc:
                         print(f"AI command mapping failed: {exc}")
                 if command:
@@ -592,12 +1051,23 @@ def main(argv: list[str]) -> int:
                     print("No command mapping found.")
             else:
                 type_to_terminal(text, keyboard, args.enter)
+            acting.clear()
 
             if not args.continuous:
                 return 0
     except KeyboardInterrupt:
         print("\nStopped by user.")
         return 0
+    finally:
+        stopping.set()
+        while not pending.empty():
+            future = pending.get_nowait()
+            if future is not None:
+                future.cancel()
+        jobs.put(None)
+        # Bounded wait for an in-flight transcription; the daemon worker is
+        # abandoned after that.
+        worker.join(timeout=1.0)
 
 
 if __name__ == "__main__":